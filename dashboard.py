@@ -2,21 +2,31 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import kagglehub
 import numpy as np
+import io
+import re
 from pathlib import Path
-from datetime import datetime, timedelta
-
-# Page configuration
-st.set_page_config(
-    page_title="Employee Salary Analytics",
-    page_icon="💼",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+from datetime import datetime
+
+# Serialize figures with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = 'orjson'
+except ImportError:
+    pass
+
+# Read and write CSV (and Feather downloads) with Arrow when it is installed
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+except ImportError:
+    pa = None
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
     <style>
     .main {
         padding: 0rem 1rem;
@@ -42,28 +52,128 @@ st.markdown("""
         margin-bottom: 30px;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+# Page configuration
+st.set_page_config(
+    page_title="Employee Salary Analytics",
+    page_icon="💼",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Apply the CSS; Streamlit rebuilds the page on every rerun, so this must run each time
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Name pattern for each dashboard role; the first column that matches wins
+COLUMN_PATTERNS = {
+    'salary': re.compile(r'salary', re.IGNORECASE),
+    'dept': re.compile(r'department|dept', re.IGNORECASE),
+    'gender': re.compile(r'gender|sex', re.IGNORECASE),
+    'age': re.compile(r'age', re.IGNORECASE),
+    'experience': re.compile(r'experience|years', re.IGNORECASE),
+    'education': re.compile(r'education|degree', re.IGNORECASE),
+    'country': re.compile(r'country|location|nation', re.IGNORECASE),
+}
+
+# Strings pandas' read_csv treats as missing by default; the Arrow reader is given the same list
+CSV_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                 '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# Map each dashboard role to its column, cached on the tuple of column names
+@st.cache_data
+def detect_columns(columns):
+    return {role: next((col for col in columns if pattern.search(col)), None)
+            for role, pattern in COLUMN_PATTERNS.items()}
+
+# Parse the CSV and normalize it: Date column, date order, categoricals and downcast numerics
+def read_employee_csv(csv_file):
+    # Probe the header so low-cardinality text columns are parsed straight into categoricals
+    cols = detect_columns(tuple(pd.read_csv(csv_file, nrows=0).columns))
+    category_cols = [col for col in (cols['dept'], cols['gender'], cols['country'], cols['education']) if col]
+    if pa is not None:
+        # Arrow's multithreaded reader, dictionary-encoding the categorical columns while parsing;
+        # dictionaries become pandas categoricals, everything else stays Arrow-backed
+        table = pa_csv.read_csv(csv_file, convert_options=pa_csv.ConvertOptions(
+            column_types={col: pa.dictionary(pa.int32(), pa.string()) for col in category_cols},
+            null_values=CSV_NA_VALUES, strings_can_be_null=True))
+        df = table.to_pandas(types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t))
+        for col in category_cols:
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    else:
+        df = pd.read_csv(csv_file, dtype={col: 'category' for col in category_cols})
+    # Ensure date column exists or create one
+    date_cols = [col for col in df.columns if 'date' in col.lower()]
+    if date_cols:
+        df['Date'] = pd.to_datetime(df[date_cols[0]], errors='coerce')
+        # Date filters compare against naive dates, so keep timezone-aware sources as naive UTC
+        if df['Date'].dt.tz is not None:
+            df['Date'] = df['Date'].dt.tz_convert(None)
+    else:
+        # Create sample dates for demo
+        offsets = np.random.randint(0, 1800, size=len(df), dtype=np.int32).astype('timedelta64[D]')
+        df['Date'] = np.datetime64('2020-01-01') + offsets
+    
+    # Remove rows with invalid dates, keeping the (sorted) categories exactly the values present
+    n_rows = len(df)
+    df = df.dropna(subset=['Date'])
+    if len(df) < n_rows:
+        for col in category_cols:
+            df[col] = df[col].cat.remove_unused_categories()
+    # Sort by date once so date-range filtering can binary search
+    df = df.sort_values('Date').reset_index(drop=True)
+    df['Year'] = df['Date'].dt.year.astype('int16')
+    # Downcast numerics where no precision is lost; a role matched to a text column is left alone
+    is_numeric = pd.api.types.is_numeric_dtype
+    if cols['salary'] and is_numeric(df[cols['salary']]):
+        df[cols['salary']] = pd.to_numeric(df[cols['salary']], downcast='float')
+    for col in (cols['age'], cols['experience']):
+        if col and is_numeric(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+# Bump whenever read_employee_csv changes what it produces, so cached Parquet files are re-parsed
+PARQUET_CACHE_VERSION = 1
+
+# Download the dataset once per server process; the path is a resource, so nothing is pickled or hashed
+@st.cache_resource
+def download_dataset():
+    return kagglehub.dataset_download("alizabrand/employee-salary-analysis-dataset")
 
 # Load data
 @st.cache_data
 def load_data():
-    path = kagglehub.dataset_download("alizabrand/employee-salary-analysis-dataset")
-    csv_files = list(Path(path).glob("*.csv"))
-    if csv_files:
-        df = pd.read_csv(csv_files[0])
-        # Ensure date column exists or create one
-        date_cols = [col for col in df.columns if 'date' in col.lower()]
-        if date_cols:
-            df['Date'] = pd.to_datetime(df[date_cols[0]], errors='coerce')
-        else:
-            # Create sample dates for demo
-            start_date = datetime(2020, 1, 1)
-            df['Date'] = [start_date + timedelta(days=np.random.randint(0, 1800)) for _ in range(len(df))]
-        
-        # Remove rows with invalid dates
-        df = df.dropna(subset=['Date'])
-        return df
-    return None
+    path = download_dataset()
+    # The normalized frame is saved as Parquet next to the CSV so server restarts skip the parse;
+    # the version in the name retires files written by an older read_employee_csv
+    parquet_file = Path(path) / f'employee.v{PARQUET_CACHE_VERSION}.parquet'
+    if pa is not None and parquet_file.exists():
+        df = pd.read_parquet(parquet_file)
+    else:
+        csv_files = list(Path(path).glob("*.csv"))
+        if not csv_files:
+            return None, None
+        df = read_employee_csv(csv_files[0])
+        if pa is not None:
+            tmp_file = parquet_file.with_suffix('.parquet.tmp')
+            try:
+                df.to_parquet(tmp_file, compression='zstd')
+                tmp_file.replace(parquet_file)
+            except (OSError, ValueError, pa.ArrowException):
+                # The cache is optional; serve the parsed frame and retry on the next load
+                tmp_file.unlink(missing_ok=True)
+
+    # Filter facets and unfiltered aggregates, computed once alongside the data
+    cols = detect_columns(tuple(df.columns))
+    meta = {
+        'min_date': df['Date'].min().date(),
+        'max_date': df['Date'].max().date(),
+    }
+    for key in ('dept', 'gender', 'country', 'education'):
+        col = cols[key]
+        meta[key] = df[col].cat.categories.tolist() if col else []
+    meta['dept_stats'] = summarize_groups(df, cols['dept'], cols['salary']) if cols['dept'] else None
+    return df, meta
 
 # Function to create salary projection
 def project_salaries(df, salary_col, years=5):
@@ -74,14 +184,114 @@ def project_salaries(df, salary_col, years=5):
     # Assume 3% annual growth
     growth_rate = 0.03
     
-    years_list = list(range(datetime.now().year, datetime.now().year + years + 1))
-    projected_salaries = [current_avg * ((1 + growth_rate) ** i) for i in range(len(years_list))]
+    years_offset = np.arange(years + 1)
+    years_list = datetime.now().year + years_offset
+    projected_salaries = current_avg * (1 + growth_rate) ** years_offset
     
     return pd.DataFrame({
         'Year': years_list,
         'Projected Average Salary': projected_salaries
     })
 
+# Filter the cached dataset; keyed on plain tuples so reruns with unchanged filters are free
+@st.cache_data
+def apply_filters(date_lo, date_hi, selections):
+    df, _ = load_data()
+    if date_lo is not None and date_hi is not None:
+        # Bounds in the column's own timezone (naive for frames from load_data)
+        tz = df['Date'].dt.tz
+        lo = pd.Timestamp(date_lo, tz=tz)
+        hi = pd.Timestamp(date_hi, tz=tz) + pd.Timedelta(days=1)
+        # Date is sorted in load_data, so the range is a contiguous slice
+        i0, i1 = df['Date'].searchsorted([lo, hi])
+        df = df.iloc[i0:i1]
+    # Combine all category filters into one mask over the integer codes and slice once
+    if selections:
+        mask = np.ones(len(df), dtype=bool)
+        for col, selected in selections:
+            wanted = df[col].cat.categories.get_indexer(selected)
+            mask &= np.isin(df[col].cat.codes.to_numpy(), wanted[wanted >= 0])
+        df = df[mask]
+    return df
+
+# Filtered data encoded as CSV, cached per filter selection
+@st.cache_data
+def to_csv_bytes(date_lo, date_hi, selections):
+    df = apply_filters(date_lo, date_hi, selections).drop(columns=['Year'])
+    if pa is None:
+        return df.to_csv(index=False).encode('utf-8')
+    # Arrow's multithreaded C++ writer instead of per-cell Python formatting
+    buf = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
+
+# Filtered data as an Arrow IPC (Feather) file, cached per filter selection
+@st.cache_data
+def to_feather_bytes(date_lo, date_hi, selections):
+    df = apply_filters(date_lo, date_hi, selections).drop(columns=['Year'])
+    buf = io.BytesIO()
+    pa_feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), buf, compression='zstd')
+    return buf.getvalue()
+
+# Frames larger than this aggregate categorical groups with np.bincount on the codes
+BINCOUNT_MIN_ROWS = 200_000
+
+# Rows per page of the data table
+TABLE_PAGE_SIZE = 100
+
+# Department pie slices beyond this many are folded into one remainder slice to bound in-slice label layout
+PIE_MAX_SLICES = 12
+
+# Per-group mean of a value column and row count from a single groupby
+def summarize_groups(df, group_col, val_col):
+    if val_col is None:
+        return df.groupby(group_col, observed=True).size().to_frame('count')
+    # Aggregate a C-contiguous float32 copy of the values to halve memory traffic
+    values = np.ascontiguousarray(df[val_col].to_numpy(dtype=np.float32, na_value=np.nan))
+    if len(df) > BINCOUNT_MIN_ROWS and isinstance(df[group_col].dtype, pd.CategoricalDtype):
+        return bincount_group_stats(df[group_col], values)
+    return pd.Series(values, index=df.index).groupby(df[group_col], observed=True).agg(mean='mean', count='size')
+
+# Same result as summarize_groups, from single linear passes over the category codes
+def bincount_group_stats(keys, values):
+    categories = keys.cat.categories
+    codes = keys.cat.codes.to_numpy()
+    has_key = codes >= 0
+    codes, values = codes[has_key], values[has_key]
+    counts = np.bincount(codes, minlength=len(categories))
+    has_value = ~np.isnan(values)
+    sums = np.bincount(codes[has_value], weights=values[has_value], minlength=len(categories))
+    value_counts = np.bincount(codes[has_value], minlength=len(categories))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / value_counts
+    present = counts > 0
+    index = pd.CategoricalIndex(categories[present], categories=categories, name=keys.name)
+    return pd.DataFrame({'mean': means[present], 'count': counts[present]}, index=index)
+
+# Chart aggregates are cached on the filter key rather than the filtered frame,
+# so a cache lookup never has to hash a DataFrame
+@st.cache_data
+def group_stats(filter_key, group_col, val_col):
+    return summarize_groups(apply_filters(*filter_key), group_col, val_col)
+
+# Salary histogram counts per department on shared bin edges
+@st.cache_data
+def salary_histogram(filter_key, dept_col, salary_col, nbins):
+    df = apply_filters(*filter_key)
+    edges = np.histogram_bin_edges(df[salary_col].dropna().to_numpy(dtype=float), bins=nbins)
+    counts = {
+        dept: np.histogram(dept_salaries.dropna().to_numpy(dtype=float), bins=edges)[0]
+        for dept, dept_salaries in df.groupby(dept_col, observed=True)[salary_col]
+    }
+    return edges, counts
+
+# Mean of a value column per bin of another column
+@st.cache_data
+def binned_mean(filter_key, bin_col, bins, labels, val_col):
+    df = apply_filters(*filter_key)
+    groups = pd.cut(df[bin_col], bins=list(bins), labels=list(labels))
+    return df.groupby(groups, observed=True)[val_col].mean()
+
 # Header
 st.markdown("""
     <div style='display: flex; align-items: center; gap: 20px; margin-bottom: 30px;'>
@@ -94,32 +304,32 @@ st.markdown("""
 
 # Load data
 with st.spinner("Loading data..."):
-    df = load_data()
+    df, meta = load_data()
 
 if df is None:
     st.error("Could not load the dataset. Please check the data source.")
     st.stop()
 
-# Store original data
-df_original = df.copy()
+# Keep a reference to the unfiltered data (filtering always builds a new frame)
+df_original = df
 
 # Detect available columns
-available_cols = df.columns.tolist()
-salary_col = next((col for col in available_cols if 'salary' in col.lower()), None)
-dept_col = next((col for col in available_cols if 'department' in col.lower() or 'dept' in col.lower()), None)
-gender_col = next((col for col in available_cols if 'gender' in col.lower() or 'sex' in col.lower()), None)
-age_col = next((col for col in available_cols if 'age' in col.lower()), None)
-experience_col = next((col for col in available_cols if 'experience' in col.lower() or 'years' in col.lower()), None)
-education_col = next((col for col in available_cols if 'education' in col.lower() or 'degree' in col.lower()), None)
-country_col = next((col for col in available_cols if 'country' in col.lower() or 'location' in col.lower() or 'nation' in col.lower()), None)
+cols = detect_columns(tuple(df.columns))
+salary_col = cols['salary']
+dept_col = cols['dept']
+gender_col = cols['gender']
+age_col = cols['age']
+experience_col = cols['experience']
+education_col = cols['education']
+country_col = cols['country']
 
 # Sidebar filters
 st.sidebar.header("🔍 Interactive Filters")
 
 # Date range filter
 st.sidebar.markdown("### 📅 Date Range")
-min_date = df['Date'].min().date()
-max_date = df['Date'].max().date()
+min_date = meta['min_date']
+max_date = meta['max_date']
 date_range = st.sidebar.date_input(
     "Select Date Range",
     value=(min_date, max_date),
@@ -127,300 +337,343 @@ date_range = st.sidebar.date_input(
     max_value=max_date
 )
 
-# Apply date filter
-if len(date_range) == 2:
-    df = df[(df['Date'].dt.date >= date_range[0]) & (df['Date'].dt.date <= date_range[1])]
-
 st.sidebar.markdown("---")
 
+# Collect (column, selected values) pairs; the filters are applied together below.
+# Selecting every option is the same as no filter, so those are left out.
+selections = []
+
 # Department filter
 if dept_col and dept_col in df.columns:
     st.sidebar.markdown("### 🏢 Department")
-    departments = sorted(df[dept_col].dropna().unique().tolist())
+    departments = meta['dept']
     selected_dept = st.sidebar.multiselect("Select Department(s)", departments, default=departments)
-    if selected_dept:
-        df = df[df[dept_col].isin(selected_dept)]
+    if selected_dept and len(selected_dept) < len(departments):
+        selections.append((dept_col, tuple(sorted(selected_dept))))
 
 # Gender filter
 if gender_col and gender_col in df.columns:
     st.sidebar.markdown("### 👥 Gender")
-    genders = sorted(df[gender_col].dropna().unique().tolist())
+    genders = meta['gender']
     selected_gender = st.sidebar.multiselect("Select Gender(s)", genders, default=genders)
-    if selected_gender:
-        df = df[df[gender_col].isin(selected_gender)]
+    if selected_gender and len(selected_gender) < len(genders):
+        selections.append((gender_col, tuple(sorted(selected_gender))))
 
 # Country filter
 if country_col and country_col in df.columns:
     st.sidebar.markdown("### 🌍 Country")
-    countries = sorted(df[country_col].dropna().unique().tolist())
+    countries = meta['country']
     selected_country = st.sidebar.multiselect("Select Country(ies)", countries, default=countries)
-    if selected_country:
-        df = df[df[country_col].isin(selected_country)]
+    if selected_country and len(selected_country) < len(countries):
+        selections.append((country_col, tuple(sorted(selected_country))))
 
 # Education filter
 if education_col and education_col in df.columns:
     st.sidebar.markdown("### 🎓 Education")
-    education_levels = sorted(df[education_col].dropna().unique().tolist())
+    education_levels = meta['education']
     selected_education = st.sidebar.multiselect("Select Education Level(s)", education_levels, default=education_levels)
-    if selected_education:
-        df = df[df[education_col].isin(selected_education)]
+    if selected_education and len(selected_education) < len(education_levels):
+        selections.append((education_col, tuple(sorted(selected_education))))
+
+# Apply filters
+date_lo, date_hi = date_range if len(date_range) == 2 else (None, None)
+filter_key = (date_lo, date_hi, tuple(selections))
+filters_active = bool(selections) or (date_lo is not None and (date_lo, date_hi) != (min_date, max_date))
+df = apply_filters(*filter_key) if filters_active else df_original
 
 st.sidebar.markdown("---")
 st.sidebar.info("💡 Use filters above to analyze specific segments!")
 
+# Department and country stats feed both the metrics and several charts;
+# with no filter active the department stats precomputed in load_data are reused
+if filters_active:
+    dept_stats = group_stats(filter_key, dept_col, salary_col) if dept_col else None
+else:
+    dept_stats = meta['dept_stats']
+country_stats = group_stats(filter_key, country_col, salary_col) if country_col else None
+
 # Key Metrics
 st.markdown("## 📈 Key Metrics")
 col1, col2, col3, col4, col5 = st.columns(5)
+salary_stats = df[salary_col].agg(['mean', 'median']) if salary_col else None
 
 with col1:
     st.metric("Total Employees", f"{len(df):,}")
 with col2:
     if salary_col:
-        avg_salary = df[salary_col].mean()
+        avg_salary = salary_stats['mean']
         st.metric("Average Salary", f"${avg_salary:,.0f}")
 with col3:
     if salary_col:
-        median_salary = df[salary_col].median()
+        median_salary = salary_stats['median']
         st.metric("Median Salary", f"${median_salary:,.0f}")
 with col4:
     if dept_col:
-        dept_count = df[dept_col].nunique()
+        dept_count = len(dept_stats)
         st.metric("Departments", dept_count)
 with col5:
     if country_col:
-        country_count = df[country_col].nunique()
+        country_count = len(country_stats)
         st.metric("Countries", country_count)
 
 st.markdown("---")
 
-# Salary Projection
-st.markdown("## 📊 5-Year Salary Projection")
-if salary_col:
-    projection_df = project_salaries(df_original, salary_col)
-    if projection_df is not None:
+# Only the selected section's figures are built and sent to the browser
+section = st.radio("Section", ["📊 Projection", "💰 Distribution", "👥 Demographics", "📈 Trends", "📋 Data"],
+                   horizontal=True, label_visibility="collapsed")
+
+if section == "📊 Projection":
+    # Salary Projection
+    st.markdown("## 📊 5-Year Salary Projection")
+    if salary_col:
+        projection_df = project_salaries(df_original, salary_col)
+        if projection_df is not None:
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=projection_df['Year'],
+                y=projection_df['Projected Average Salary'],
+                mode='lines+markers+text',
+                name='Projected Salary',
+                text=[f'${val:,.0f}' for val in projection_df['Projected Average Salary']],
+                textposition='top center',
+                line=dict(color='#1f77b4', width=3),
+                marker=dict(size=10)
+            ))
+            fig.update_layout(
+                title="Expected Average Annual Salary Growth (3% yearly)",
+                xaxis_title="Year",
+                yaxis_title="Average Salary ($)",
+                hovermode='x unified',
+                height=400
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+elif section == "💰 Distribution":
+    # Row 1: Histogram and Geo Map
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 💰 Salary Distribution by Department")
+        if salary_col and dept_col:
+            # Send one stacked bar trace of pre-binned counts per department instead of every salary
+            edges, dept_bins = salary_histogram(filter_key, dept_col, salary_col, nbins=30)
+            centers = (edges[:-1] + edges[1:]) / 2
+            colors = px.colors.qualitative.Set3
+            fig = go.Figure()
+            for i, (dept, counts) in enumerate(dept_bins.items()):
+                fig.add_trace(go.Bar(x=centers, y=counts, name=str(dept),
+                                     marker_color=colors[i % len(colors)]))
+            fig.update_layout(
+                barmode='stack',
+                bargap=0.1,
+                xaxis_title='Salary',
+                yaxis_title='count',
+                legend_title_text='Department',
+                height=400,
+                showlegend=True,
+                legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02)
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("### 🌍 Average Salary by Country (Interactive Map)")
+        if salary_col and country_col:
+            country_salary = country_stats.reset_index()
+            country_salary.columns = [country_col, 'Average Salary', 'Employee Count']
+
+            # Create choropleth map
+            fig = px.choropleth(
+                country_salary,
+                locations=country_col,
+                locationmode='country names',
+                color='Average Salary',
+                hover_name=country_col,
+                hover_data={'Average Salary': ':$,.0f', 'Employee Count': ':,'},
+                color_continuous_scale='Viridis',
+                labels={'Average Salary': 'Avg Salary'}
+            )
+            fig.update_layout(
+                height=400,
+                geo=dict(showframe=False, showcoastlines=True, projection_type='natural earth')
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+elif section == "👥 Demographics":
+    # Row 2: Department distribution and Gender analysis
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 🏢 Employee Distribution by Department")
+        if dept_col:
+            dept_counts = dept_stats['count']
+            labels, values = dept_counts.index.tolist(), dept_counts.to_numpy()
+            if len(dept_counts) > PIE_MAX_SLICES:
+                # The label names the folded count so it can't merge with a real "Other" department
+                top = dept_counts.sort_values(ascending=False)
+                labels = top.index[:PIE_MAX_SLICES].tolist() + [f"Other ({len(top) - PIE_MAX_SLICES} departments)"]
+                values = np.append(top.to_numpy()[:PIE_MAX_SLICES], top.to_numpy()[PIE_MAX_SLICES:].sum())
+            fig = go.Figure(go.Pie(labels=labels, values=values,
+                                   hole=0.4, marker_colors=px.colors.qualitative.Set3))
+            fig.update_traces(textposition='inside', textinfo='percent+label+value')
+            fig.update_layout(height=400)
+            st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("### 👥 Gender Pay Analysis")
+        if gender_col and salary_col:
+            gender_salary = group_stats(filter_key, gender_col, salary_col)['mean']
+            colors = ['#ff7f0e', '#2ca02c', '#9467bd']
+            fig = go.Figure(go.Bar(x=gender_salary.index, y=gender_salary.to_numpy(),
+                                   text=gender_salary.to_numpy(),
+                                   marker_color=[colors[i % len(colors)] for i in range(len(gender_salary))]))
+            fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
+            fig.update_layout(showlegend=False, height=400,
+                              xaxis_title='Gender', yaxis_title='Average Salary')
+            st.plotly_chart(fig, use_container_width=True)
+
+    # Row 3: Country distribution and Education impact
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 🌍 Employee Distribution by Country")
+        if country_col:
+            country_counts = country_stats['count'].sort_values(ascending=False).head(10)
+            fig = go.Figure(go.Bar(x=country_counts.index, y=country_counts.to_numpy(),
+                                   text=country_counts.to_numpy(),
+                                   marker=dict(color=country_counts.to_numpy(), colorscale='Teal', showscale=True,
+                                               colorbar=dict(title='Number of Employees'))))
+            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            fig.update_layout(showlegend=False, height=400, xaxis_tickangle=-45,
+                              xaxis_title='Country', yaxis_title='Number of Employees')
+            st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("### 🎓 Salary by Education Level")
+        if education_col and salary_col:
+            edu_salary = group_stats(filter_key, education_col, salary_col)['mean'].sort_values(ascending=False)
+            fig = go.Figure(go.Bar(x=edu_salary.index, y=edu_salary.to_numpy(),
+                                   text=edu_salary.to_numpy(),
+                                   marker=dict(color=edu_salary.to_numpy(), colorscale='Oranges', showscale=True,
+                                               colorbar=dict(title='Average Salary'))))
+            fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
+            fig.update_layout(showlegend=False, height=400, xaxis_tickangle=-45,
+                              xaxis_title='Education', yaxis_title='Average Salary')
+            st.plotly_chart(fig, use_container_width=True)
+
+elif section == "📈 Trends":
+    # Row 4: Annual Salary Trends Analysis
+    st.markdown("### 📈 Annual Salary Trends Analysis")
+
+    if salary_col and experience_col:
+        # Average salary per experience bin
+        exp_salary = binned_mean(filter_key, experience_col, (0, 2, 5, 10, 20, 100),
+                                 ('0-2 years', '3-5 years', '6-10 years', '11-20 years', '20+ years'), salary_col)
+
         fig = go.Figure()
         fig.add_trace(go.Scatter(
-            x=projection_df['Year'],
-            y=projection_df['Projected Average Salary'],
+            x=exp_salary.index,
+            y=exp_salary.to_numpy(),
             mode='lines+markers+text',
-            name='Projected Salary',
-            text=[f'${val:,.0f}' for val in projection_df['Projected Average Salary']],
+            name='Average Salary',
+            text=[f'${val:,.0f}' for val in exp_salary],
             textposition='top center',
-            line=dict(color='#1f77b4', width=3),
-            marker=dict(size=10)
+            line=dict(color='#e74c3c', width=3),
+            marker=dict(size=12)
         ))
         fig.update_layout(
-            title="Expected Average Annual Salary Growth (3% yearly)",
-            xaxis_title="Year",
+            title="Average Salary by Experience Level",
+            xaxis_title="Experience Level",
             yaxis_title="Average Salary ($)",
-            hovermode='x unified',
-            height=400
+            height=400,
+            hovermode='x unified'
         )
         st.plotly_chart(fig, use_container_width=True)
 
-st.markdown("---")
-
-# Row 1: Histogram and Geo Map
-col1, col2 = st.columns(2)
+    elif salary_col and age_col:
+        # Average salary per age bin
+        age_salary = binned_mean(filter_key, age_col, (0, 25, 35, 45, 55, 100),
+                                 ('<25', '26-35', '36-45', '46-55', '55+'), salary_col)
 
-with col1:
-    st.markdown("### 💰 Salary Distribution by Department")
-    if salary_col and dept_col:
-        fig = px.histogram(df, x=salary_col, color=dept_col,
-                          nbins=30,
-                          labels={salary_col: 'Salary', dept_col: 'Department'},
-                          color_discrete_sequence=px.colors.qualitative.Set3)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=age_salary.index,
+            y=age_salary.to_numpy(),
+            mode='lines+markers+text',
+            name='Average Salary',
+            text=[f'${val:,.0f}' for val in age_salary],
+            textposition='top center',
+            line=dict(color='#e74c3c', width=3),
+            marker=dict(size=12)
+        ))
         fig.update_layout(
-            bargap=0.1,
+            title="Average Salary by Age Group",
+            xaxis_title="Age Group",
+            yaxis_title="Average Salary ($)",
             height=400,
-            showlegend=True,
-            legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.02)
+            hovermode='x unified'
         )
         st.plotly_chart(fig, use_container_width=True)
 
-with col2:
-    st.markdown("### 🌍 Average Salary by Country (Interactive Map)")
-    if salary_col and country_col:
-        country_salary = df.groupby(country_col)[salary_col].agg(['mean', 'count']).reset_index()
-        country_salary.columns = [country_col, 'Average Salary', 'Employee Count']
-        
-        # Create choropleth map
-        fig = px.choropleth(
-            country_salary,
-            locations=country_col,
-            locationmode='country names',
-            color='Average Salary',
-            hover_name=country_col,
-            hover_data={'Average Salary': ':$,.0f', 'Employee Count': ':,'},
-            color_continuous_scale='Viridis',
-            labels={'Average Salary': 'Avg Salary'}
-        )
+    # Annual Salary trends over time
+    st.markdown("### 📅 Annual Salary Trends Over Time")
+    if salary_col:
+        annual_salary = group_stats(filter_key, 'Year', salary_col)['mean']
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=annual_salary.index,
+            y=annual_salary.to_numpy(),
+            mode='lines+markers+text',
+            name='Average Salary',
+            text=[f'${val:,.0f}' for val in annual_salary],
+            textposition='top center',
+            line=dict(color='#3498db', width=3),
+            marker=dict(size=10)
+        ))
         fig.update_layout(
+            title="Average Salary Trend by Year",
+            xaxis_title="Year",
+            yaxis_title="Average Salary ($)",
             height=400,
-            geo=dict(showframe=False, showcoastlines=True, projection_type='natural earth')
+            hovermode='x unified',
+            xaxis=dict(
+                tickmode='linear',
+                tick0=annual_salary.index.min(),
+                dtick=1
+            )
         )
         st.plotly_chart(fig, use_container_width=True)
 
-# Row 2: Department distribution and Gender analysis
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("### 🏢 Employee Distribution by Department")
-    if dept_col:
-        dept_counts = df[dept_col].value_counts().reset_index()
-        dept_counts.columns = [dept_col, 'Count']
-        fig = px.pie(dept_counts, values='Count', names=dept_col,
-                    hole=0.4, color_discrete_sequence=px.colors.qualitative.Set3)
-        fig.update_traces(textposition='inside', textinfo='percent+label+value')
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
-
-with col2:
-    st.markdown("### 👥 Gender Pay Analysis")
-    if gender_col and salary_col:
-        gender_salary = df.groupby(gender_col)[salary_col].mean().reset_index()
-        fig = px.bar(gender_salary, x=gender_col, y=salary_col,
-                    color=gender_col,
-                    text=salary_col,
-                    color_discrete_sequence=['#ff7f0e', '#2ca02c', '#9467bd'],
-                    labels={gender_col: 'Gender', salary_col: 'Average Salary'})
-        fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
-        fig.update_layout(showlegend=False, height=400)
-        st.plotly_chart(fig, use_container_width=True)
-
-# Row 3: Country distribution and Education impact
-col1, col2 = st.columns(2)
-
-with col1:
-    st.markdown("### 🌍 Employee Distribution by Country")
-    if country_col:
-        country_counts = df[country_col].value_counts().head(10).reset_index()
-        country_counts.columns = [country_col, 'Count']
-        fig = px.bar(country_counts, x=country_col, y='Count',
-                    color='Count',
-                    text='Count',
-                    color_continuous_scale='Teal',
-                    labels={country_col: 'Country', 'Count': 'Number of Employees'})
-        fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig.update_layout(showlegend=False, height=400, xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
-
-with col2:
-    st.markdown("### 🎓 Salary by Education Level")
-    if education_col and salary_col:
-        edu_salary = df.groupby(education_col)[salary_col].mean().sort_values(ascending=False).reset_index()
-        fig = px.bar(edu_salary, x=education_col, y=salary_col,
-                    color=salary_col,
-                    text=salary_col,
-                    color_continuous_scale='Oranges',
-                    labels={education_col: 'Education', salary_col: 'Average Salary'})
-        fig.update_traces(texttemplate='$%{text:,.0f}', textposition='outside')
-        fig.update_layout(showlegend=False, height=400, xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
-
-# Row 4: Annual Salary Trends Analysis
-st.markdown("### 📈 Annual Salary Trends Analysis")
-
-if salary_col and experience_col:
-    # Create bins for experience
-    df['Experience_Group'] = pd.cut(df[experience_col], bins=[0, 2, 5, 10, 20, 100],
-                                     labels=['0-2 years', '3-5 years', '6-10 years', '11-20 years', '20+ years'])
-    
-    exp_salary = df.groupby('Experience_Group')[salary_col].mean().reset_index()
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=exp_salary['Experience_Group'],
-        y=exp_salary[salary_col],
-        mode='lines+markers+text',
-        name='Average Salary',
-        text=[f'${val:,.0f}' for val in exp_salary[salary_col]],
-        textposition='top center',
-        line=dict(color='#e74c3c', width=3),
-        marker=dict(size=12)
-    ))
-    fig.update_layout(
-        title="Average Salary by Experience Level",
-        xaxis_title="Experience Level",
-        yaxis_title="Average Salary ($)",
-        height=400,
-        hovermode='x unified'
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-elif salary_col and age_col:
-    # Create age groups
-    df['Age_Group'] = pd.cut(df[age_col], bins=[0, 25, 35, 45, 55, 100],
-                              labels=['<25', '26-35', '36-45', '46-55', '55+'])
-    
-    age_salary = df.groupby('Age_Group')[salary_col].mean().reset_index()
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=age_salary['Age_Group'],
-        y=age_salary[salary_col],
-        mode='lines+markers+text',
-        name='Average Salary',
-        text=[f'${val:,.0f}' for val in age_salary[salary_col]],
-        textposition='top center',
-        line=dict(color='#e74c3c', width=3),
-        marker=dict(size=12)
-    ))
-    fig.update_layout(
-        title="Average Salary by Age Group",
-        xaxis_title="Age Group",
-        yaxis_title="Average Salary ($)",
-        height=400,
-        hovermode='x unified'
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-# Annual Salary trends over time
-st.markdown("### 📅 Annual Salary Trends Over Time")
-if salary_col:
-    df['Year'] = df['Date'].dt.year
-    annual_salary = df.groupby('Year')[salary_col].mean().reset_index()
-    annual_salary = annual_salary.sort_values('Year')
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=annual_salary['Year'],
-        y=annual_salary[salary_col],
-        mode='lines+markers+text',
-        name='Average Salary',
-        text=[f'${val:,.0f}' for val in annual_salary[salary_col]],
-        textposition='top center',
-        line=dict(color='#3498db', width=3),
-        marker=dict(size=10)
-    ))
-    fig.update_layout(
-        title="Average Salary Trend by Year",
-        xaxis_title="Year",
-        yaxis_title="Average Salary ($)",
-        height=400,
-        hovermode='x unified',
-        xaxis=dict(
-            tickmode='linear',
-            tick0=annual_salary['Year'].min(),
-            dtick=1
+elif section == "📋 Data":
+    # Data table
+    st.markdown("### 📋 Filtered Data Table")
+    display_cols = [col for col in df.columns if col != 'Year']
+    # Only the current page of rows is sent to the browser
+    page_count = max(1, -(-len(df) // TABLE_PAGE_SIZE))
+    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    start = (page - 1) * TABLE_PAGE_SIZE
+    st.dataframe(df.iloc[start:start + TABLE_PAGE_SIZE][display_cols], use_container_width=True, height=400)
+    st.caption(f"Page {page} of {page_count} ({len(df):,} rows)")
+
+    # Download buttons; each file is only encoded when its button is clicked
+    file_stem = f"filtered_employee_data_{datetime.now().strftime('%Y%m%d')}"
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 Download Filtered Data as CSV",
+            data=lambda: to_csv_bytes(*filter_key),
+            file_name=f"{file_stem}.csv",
+            mime="text/csv",
         )
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-# Data table
-st.markdown("---")
-st.markdown("### 📋 Filtered Data Table")
-display_cols = [col for col in df.columns if col not in ['Experience_Group', 'Age_Group', 'Year']]
-st.dataframe(df[display_cols], use_container_width=True, height=400)
-
-# Download button
-csv = df[display_cols].to_csv(index=False).encode('utf-8')
-st.download_button(
-    label="📥 Download Filtered Data as CSV",
-    data=csv,
-    file_name=f"filtered_employee_data_{datetime.now().strftime('%Y%m%d')}.csv",
-    mime="text/csv",
-)
+    # Arrow IPC keeps column types and skips per-cell text formatting
+    if pa is not None:
+        with col2:
+            st.download_button(
+                label="📥 Download Filtered Data as Arrow/Feather",
+                data=lambda: to_feather_bytes(*filter_key),
+                file_name=f"{file_stem}.arrow",
+                mime="application/vnd.apache.arrow.file",
+            )
 
 # Footer
 st.markdown("---")